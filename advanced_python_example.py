@@ -17,24 +17,45 @@ like knowledge base search and customer history lookup.
 
 import os
 import asyncio
-import time
-from typing import Dict, Any, List
+import re
 import sys
-sys.path.append('../tygent-py')
+import time
+from functools import lru_cache
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from tygent import accelerate
 
+# Use uvloop's faster event loop when it is installed
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Set your API key - in production use environment variables
 # os.environ["OPENAI_API_KEY"] = "your-api-key"  # Uncomment and set your API key
 
+# Simulated service latency - set TYGENT_DEMO=0 to measure scheduling overhead alone
+SIMULATED_LATENCY = os.getenv("TYGENT_DEMO", "1") != "0"
+
+async def simulated_io(delay: float) -> None:
+    """Wait ``delay`` seconds in place of a real service call, if latency simulation is on."""
+    if SIMULATED_LATENCY:
+        await asyncio.sleep(delay)
+
+def _freeze(table: Dict[str, Any]) -> Mapping[str, Any]:
+    """Return a read-only view of a lookup table with interned keys."""
+    return MappingProxyType({sys.intern(key): value for key, value in table.items()})
+
 # Simulated database
-KNOWLEDGE_BASE = {
+KNOWLEDGE_BASE = _freeze({
     "product_return": "Products can be returned within 30 days with receipt for a full refund.",
     "shipping_time": "Standard shipping takes 3-5 business days. Express shipping takes 1-2 business days.",
     "account_reset": "You can reset your password by clicking 'Forgot Password' on the login page.",
     "product_warranty": "Our products come with a 1-year limited warranty covering manufacturing defects."
-}
+})
 
-CUSTOMER_DATABASE = {
+CUSTOMER_DATABASE = _freeze({
     "user123": {
         "name": "Jane Smith",
         "purchases": [
@@ -52,13 +73,99 @@ CUSTOMER_DATABASE = {
         "subscription": "Basic",
         "account_created": "2025-01-15"
     }
-}
+})
+
+PRODUCT_RECOMMENDATIONS = _freeze({
+    "Wireless Headphones": ("Headphone Case", "Bluetooth Adapter", "Extended Warranty"),
+    "Smart Speaker": ("Smart Bulbs", "Voice Remote", "Speaker Stand"),
+    "Smartphone": ("Phone Case", "Screen Protector", "Wireless Charger")
+})
+
+PREMIUM_SUPPORT_MESSAGE = "As a Premium member, you have access to our priority support line at 1-800-555-HELP.\n\n"
+
+class BatchLoader:
+    """Coalesces concurrent single-key lookups into one bulk fetch.
+
+    Keys requested within ``window`` seconds of each other are passed to
+    ``fetch_many`` together, and each caller receives the value for its own key.
+    """
 
-PRODUCT_RECOMMENDATIONS = {
-    "Wireless Headphones": ["Headphone Case", "Bluetooth Adapter", "Extended Warranty"],
-    "Smart Speaker": ["Smart Bulbs", "Voice Remote", "Speaker Stand"],
-    "Smartphone": ["Phone Case", "Screen Protector", "Wireless Charger"]
-}
+    def __init__(self, fetch_many: Callable[[List[Any]], Awaitable[Dict[Any, Any]]], window: float = 0.005):
+        self.fetch_many = fetch_many
+        self.window = window
+        self._pending: Dict[Any, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def load(self, key: Any, default: Any = None) -> Any:
+        loop = asyncio.get_running_loop()
+        flush_task = self._flush_task
+        if flush_task is None or flush_task.done() or flush_task.get_loop() is not loop:
+            # Start a new batch, dropping waiters stranded by a flush that can no
+            # longer run (e.g. one left behind by an earlier asyncio.run)
+            live: Dict[Any, List[asyncio.Future]] = {}
+            for pending_key, futures in self._pending.items():
+                futures = [f for f in futures if f.get_loop() is loop and not f.done()]
+                if futures:
+                    live[pending_key] = futures
+            self._pending = live
+            self._flush_task = loop.create_task(self._flush())
+        future = loop.create_future()
+        self._pending.setdefault(key, []).append(future)
+        result = await future
+        return default if result is None else result
+
+    async def _flush(self) -> None:
+        pending: Dict[Any, List[asyncio.Future]] = {}
+        try:
+            await asyncio.sleep(self.window)
+            pending, self._pending = self._pending, {}
+            self._flush_task = None
+            results = await self.fetch_many(list(pending))
+        except BaseException as e:
+            if self._flush_task is asyncio.current_task():
+                # Cancelled while the batch was still open
+                pending, self._pending = self._pending, {}
+                self._flush_task = None
+            for future in chain.from_iterable(pending.values()):
+                if future.done():
+                    continue
+                if isinstance(e, Exception):
+                    future.set_exception(e)
+                else:
+                    future.cancel()
+            if not isinstance(e, Exception):
+                raise
+            return
+        for key, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(key))
+
+# Keyword matcher for question intents, compiled once into a single pattern
+_INTENT_RE = re.compile(
+    r"(?P<product_return>return|refund)"
+    r"|(?P<shipping_time>shipping|delivery)"
+    r"|(?P<account_reset>password|login|reset)"
+    r"|(?P<product_warranty>warranty|broken)",
+    re.IGNORECASE
+)
+
+INTENT_KEYWORDS = _freeze({
+    "product_return": ("return", "refund"),
+    "shipping_time": ("shipping", "delivery"),
+    "account_reset": ("password", "account"),
+    "product_warranty": ("warranty", "repair"),
+    "general": ()
+})
+
+@lru_cache(maxsize=4096)
+def _classify(question: str) -> Tuple[str, Tuple[str, ...]]:
+    """Classify a lowercased question into an intent and its keywords."""
+    # In a real implementation, this would use an LLM or classifier
+    # For demo purposes, using simple keyword matching
+    match = _INTENT_RE.search(question)
+    intent = sys.intern(match.lastgroup) if match else "general"
+    return intent, INTENT_KEYWORDS[intent]
 
 # Tool functions for our agent
 async def analyze_question(inputs: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,37 +173,36 @@ async def analyze_question(inputs: Dict[str, Any]) -> Dict[str, Any]:
     question = inputs.get("question", "")
     print(f"Analyzing question: {question}")
     
-    # In a real implementation, this would use an LLM or classifier
-    # For demo purposes, using simple keyword matching
-    keywords = []
-    intent = "general"
-    
-    if "return" in question.lower() or "refund" in question.lower():
-        keywords.append("return")
-        keywords.append("refund")
-        intent = "product_return"
-    elif "shipping" in question.lower() or "delivery" in question.lower():
-        keywords.append("shipping")
-        keywords.append("delivery")
-        intent = "shipping_time"
-    elif "password" in question.lower() or "login" in question.lower() or "reset" in question.lower():
-        keywords.append("password")
-        keywords.append("account")
-        intent = "account_reset"
-    elif "warranty" in question.lower() or "broken" in question.lower():
-        keywords.append("warranty")
-        keywords.append("repair")
-        intent = "product_warranty"
-    
-    # Add a simulated delay to represent real analysis time
-    await asyncio.sleep(0.5)
+    hits = _classify.cache_info().hits
+    intent, keywords = _classify(question.lower())
+    
+    # Add a simulated delay to represent real analysis time; repeated
+    # questions are answered from the classification cache
+    if _classify.cache_info().hits == hits:
+        await simulated_io(0.5)
     
     return {
         "intent": intent,
-        "keywords": keywords,
+        "keywords": list(keywords),
         "confidence": 0.85
     }
 
+async def search_knowledge_bases(intents: List[str]) -> Dict[str, str]:
+    """Look up knowledge base entries for several intents in one query."""
+    print(f"Querying knowledge base for intents: {intents}")
+    
+    # In a real implementation, this would use a vector search or database query
+    # For demo purposes, using direct lookup based on intent
+    results = {intent: KNOWLEDGE_BASE[intent] for intent in intents if intent in KNOWLEDGE_BASE}
+    
+    # Add a simulated delay to represent real database query time
+    await simulated_io(0.7)
+    
+    return results
+
+# Concurrent knowledge base searches are coalesced into one bulk query
+knowledge_loader = BatchLoader(search_knowledge_bases)
+
 async def search_knowledge_base(inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Search for relevant information in the knowledge base."""
     intent = inputs.get("intent", "general")
@@ -104,30 +210,37 @@ async def search_knowledge_base(inputs: Dict[str, Any]) -> Dict[str, Any]:
     
     print(f"Searching knowledge base for intent: {intent}, keywords: {keywords}")
     
-    # In a real implementation, this would use a vector search or database query
-    # For demo purposes, using direct lookup based on intent
-    knowledge_base_result = KNOWLEDGE_BASE.get(intent, "No specific information found.")
-    
-    # Add a simulated delay to represent real database query time
-    await asyncio.sleep(0.7)
+    knowledge_base_result = await knowledge_loader.load(intent, "No specific information found.")
     
     return {
         "knowledge_result": knowledge_base_result,
         "sources": [f"knowledge_base:{intent}"]
     }
 
+async def get_customer_histories(user_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Retrieve account information for several customers in one query."""
+    print(f"Fetching customer records for users: {user_ids}")
+    
+    # In a real implementation, this would be a single bulk query, e.g.
+    # SELECT ... WHERE user_id = ANY($1)
+    # For demo purposes, using a mock database lookup
+    records = {user_id: CUSTOMER_DATABASE[user_id] for user_id in user_ids if user_id in CUSTOMER_DATABASE}
+    
+    # Add a simulated delay to represent real database query time
+    await simulated_io(0.8)
+    
+    return records
+
+# Concurrent customer lookups are coalesced into one bulk query
+customer_loader = BatchLoader(get_customer_histories)
+
 async def get_customer_history(inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Retrieve customer purchase history and account information."""
     user_id = inputs.get("user_id", "")
     
     print(f"Getting customer history for user: {user_id}")
     
-    # In a real implementation, this would query a customer database
-    # For demo purposes, using a mock database lookup
-    customer_info = CUSTOMER_DATABASE.get(user_id, {})
-    
-    # Add a simulated delay to represent real database query time
-    await asyncio.sleep(0.8)
+    customer_info = await customer_loader.load(user_id, {})
     
     if not customer_info:
         return {"error": "Customer not found"}
@@ -139,62 +252,79 @@ async def get_customer_history(inputs: Dict[str, Any]) -> Dict[str, Any]:
         "account_age": "5 months"  # In a real system, this would be calculated
     }
 
+def _top_recommendations(products: Iterable[str], limit: int = 3) -> List[str]:
+    """Pick the top recommendations for a customer's purchased products."""
+    # Deduplicate recommendations while keeping them in purchase order
+    recommendations = dict.fromkeys(chain.from_iterable(
+        PRODUCT_RECOMMENDATIONS.get(product, ()) for product in products
+    ))
+    return list(islice(recommendations, limit))
+
 async def generate_product_recommendations(inputs: Dict[str, Any]) -> Dict[str, Any]:
     """Generate product recommendations based on purchase history."""
     purchases = inputs.get("purchase_history", [])
-    
-    recommendations = []
-    for purchase in purchases:
-        product = purchase.get("product", "")
-        if product in PRODUCT_RECOMMENDATIONS:
-            recommendations.extend(PRODUCT_RECOMMENDATIONS[product])
-    
-    # Deduplicate recommendations
-    recommendations = list(set(recommendations))
+    recommendations = _top_recommendations(purchase.get("product", "") for purchase in purchases)
     
     # Add a simulated delay
-    await asyncio.sleep(0.3)
+    await simulated_io(0.3)
     
     return {
-        "recommended_products": recommendations[:3]  # Top 3 recommendations
+        "recommended_products": recommendations  # Top 3 recommendations
     }
 
-async def generate_response(inputs: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate a personalized response to the customer question."""
+async def render_answer(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the answer section of the response from the knowledge base result."""
     question = inputs.get("question", "")
     knowledge_result = inputs.get("knowledge_result", "")
+    
+    # Add a simulated delay to represent generation time for this section
+    await simulated_io(0.25)
+    
+    return {"answer": f"Regarding your question about '{question}':\n{knowledge_result}\n\n"}
+
+async def render_customer_sections(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Render the greeting and closing sections of the response from the customer profile."""
     customer_name = inputs.get("customer_name", "")
     subscription_tier = inputs.get("subscription_tier", "")
     recommended_products = inputs.get("recommended_products", [])
     
-    # In a real implementation, this would use an LLM with a prompt
-    # For demo purposes, using template-based generation
-    
-    # Personalized greeting
-    response = f"Hello {customer_name}, thanks for contacting our support team.\n\n"
-    
-    # Answer to question
-    response += f"Regarding your question about '{question}':\n{knowledge_result}\n\n"
+    closing = []
     
     # Subscription tier message
     if subscription_tier == "Premium":
-        response += "As a Premium member, you have access to our priority support line at 1-800-555-HELP.\n\n"
+        closing.append(PREMIUM_SUPPORT_MESSAGE)
     
     # Product recommendations
     if recommended_products:
-        response += "Based on your previous purchases, you might also be interested in:\n"
-        for product in recommended_products:
-            response += f"- {product}\n"
+        closing.append("Based on your previous purchases, you might also be interested in:\n")
+        closing.extend(f"- {product}\n" for product in recommended_products)
     
-    # Add a simulated delay to represent generation time
-    await asyncio.sleep(0.5)
+    # Add a simulated delay to represent generation time for these sections
+    await simulated_io(0.25)
     
+    return {
+        "greeting": f"Hello {customer_name}, thanks for contacting our support team.\n\n",
+        "closing": "".join(closing)
+    }
+
+def _assemble_response(sections: Dict[str, str]) -> Dict[str, Any]:
+    """Join the rendered sections into the final response."""
+    response = "".join((sections["greeting"], sections["answer"], sections["closing"]))
     return {
         "response_text": response,
         "response_sentiment": "helpful",
         "response_length": len(response)
     }
 
+async def generate_response(inputs: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate a personalized response to the customer question."""
+    # In a real implementation, this would use an LLM with a prompt
+    # For demo purposes, using template-based generation, one section at a time
+    sections = await render_customer_sections(inputs)
+    sections.update(await render_answer(inputs))
+    
+    return _assemble_response(sections)
+
 # Your existing customer support workflow - no changes needed
 async def customer_support_workflow(question: str, user_id: str) -> str:
     """Complete customer support workflow that processes a customer question."""
@@ -228,6 +358,65 @@ async def customer_support_workflow(question: str, user_id: str) -> str:
     
     return response["response_text"]
 
+# The same workflow with the independent branches parallelized by hand
+async def manual_parallel_workflow(question: str, user_id: str, stream: bool = False) -> str:
+    """Customer support workflow with the two independent branches run concurrently.
+
+    With ``stream=True`` each branch's sections of the response are rendered as
+    soon as that branch finishes (via asyncio.as_completed), instead of waiting
+    for both branches with asyncio.gather before generating the response.
+    """
+    print(f"Processing customer query: '{question}' for user: {user_id}")
+
+    # Branch 1: analyze the question, then search the knowledge base
+    async def knowledge_branch() -> Dict[str, Any]:
+        analysis = await analyze_question({"question": question})
+        knowledge = await search_knowledge_base({
+            "intent": analysis["intent"],
+            "keywords": analysis["keywords"]
+        })
+        return {"knowledge_result": knowledge["knowledge_result"]}
+
+    # Branch 2: look up the customer, then generate recommendations
+    async def customer_branch() -> Dict[str, Any]:
+        customer_info = await get_customer_history({"user_id": user_id})
+        recommendations = await generate_product_recommendations({
+            "purchase_history": customer_info.get("purchase_history", [])
+        })
+        return {
+            "customer_name": customer_info.get("customer_name", ""),
+            "subscription_tier": customer_info.get("subscription_tier", ""),
+            "recommended_products": recommendations["recommended_products"]
+        }
+
+    # Schedule both branches immediately so their I/O overlaps
+    branches = [
+        asyncio.create_task(knowledge_branch()),
+        asyncio.create_task(customer_branch())
+    ]
+
+    if not stream:
+        response_inputs = {"question": question}
+        for partial in await asyncio.gather(*branches):
+            response_inputs.update(partial)
+        response = await generate_response(response_inputs)
+        return response["response_text"]
+
+    # Start rendering each branch's sections of the response as soon as that
+    # branch lands, while the other branch is still running
+    renders = []
+    for next_branch in asyncio.as_completed(branches):
+        partial = await next_branch
+        render = render_answer if "knowledge_result" in partial else render_customer_sections
+        renders.append(asyncio.create_task(render({"question": question, **partial})))
+        print(f"Rendering response sections from: {', '.join(partial)}")
+
+    sections: Dict[str, str] = {}
+    for rendered in await asyncio.gather(*renders):
+        sections.update(rendered)
+
+    return _assemble_response(sections)["response_text"]
+
 async def main():
     print("Advanced Customer Support Agent with Tygent")
     print("===========================================\n")
@@ -240,28 +429,42 @@ async def main():
     print(f"Customer ID: {customer_id}\n")
     
     print("=== Standard Execution ===")
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     
     # Run your existing workflow normally
     standard_response = await customer_support_workflow(customer_query, customer_id)
     
-    standard_time = time.time() - start_time
+    standard_time = (time.perf_counter_ns() - start_time) / 1e9
     print(f"Standard execution time: {standard_time:.2f} seconds")
     print(f"Response: {standard_response[:100]}...\n")
-    
+
+    print("=== Manual Parallel Execution ===")
+    # Start from a cold classification cache so the timings stay comparable
+    _classify.cache_clear()
+    start_time = time.perf_counter_ns()
+
+    # Hand-written baseline: run the independent branches concurrently and
+    # stream their outputs into the response as each one finishes
+    manual_response = await manual_parallel_workflow(customer_query, customer_id, stream=True)
+
+    manual_time = (time.perf_counter_ns() - start_time) / 1e9
+    print(f"Manual parallel execution time: {manual_time:.2f} seconds")
+    print(f"Response: {manual_response[:100]}...\n")
+
     print("=== Accelerated Execution ===")
-    start_time = time.time()
+    _classify.cache_clear()
+    start_time = time.perf_counter_ns()
     
     # Only change: wrap your existing workflow with accelerate()
     accelerated_workflow = accelerate(customer_support_workflow)
     accelerated_response = await accelerated_workflow(customer_query, customer_id)
     
-    accelerated_time = time.time() - start_time
+    accelerated_time = (time.perf_counter_ns() - start_time) / 1e9
     print(f"Accelerated execution time: {accelerated_time:.2f} seconds")
     print(f"Response: {accelerated_response[:100]}...")
     
     # Results should be identical
-    print(f"\nResults match: {standard_response == accelerated_response}")
+    print(f"\nResults match: {standard_response == manual_response == accelerated_response}")
     
     if standard_time > accelerated_time:
         improvement = ((standard_time - accelerated_time) / standard_time) * 100
@@ -273,5 +476,23 @@ async def main():
     print("   • Maintained the correct dependency order for final response")
     print("   • Delivered identical results with improved performance")
 
+    print("\n=== Batched Multi-Query Execution ===")
+    support_queue = [
+        (customer_query, customer_id),
+        ("How long does shipping take?", "user456"),
+        ("My smart speaker is broken, is it under warranty?", "user123")
+    ]
+    _classify.cache_clear()
+    start_time = time.perf_counter_ns()
+    
+    # Submit every query at once; lookups that become ready together are
+    # coalesced into a single bulk query per tool
+    batched_responses = await asyncio.gather(*(
+        manual_parallel_workflow(question, user_id) for question, user_id in support_queue
+    ))
+    
+    batched_time = (time.perf_counter_ns() - start_time) / 1e9
+    print(f"Answered {len(batched_responses)} queries in {batched_time:.2f} seconds")
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -15,10 +15,14 @@ import asyncio
 import time
 import random
 from typing import Dict, Any
-import sys
-sys.path.append('../tygent-py')
 from tygent import accelerate
 
+# Use uvloop's faster event loop when it is installed
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Simulated external services
 async def weather_api_call(location: str) -> Dict[str, Any]:
     """Simulated weather API that sometimes fails."""
@@ -161,11 +165,11 @@ async def main():
         
         # Standard execution
         print("\n=== Standard Execution ===")
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         try:
             standard_result = await travel_planning_workflow(destination)
-            standard_time = time.time() - start_time
+            standard_time = (time.perf_counter_ns() - start_time) / 1e9
             print(f"Result: {standard_result}")
             print(f"Execution time: {standard_time:.2f} seconds")
         except Exception as e:
@@ -173,7 +177,7 @@ async def main():
             continue
         
         print("\n=== Accelerated with Dynamic Adaptation ===")
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
         # The accelerate() function automatically adds dynamic DAG modification
         # capabilities to handle the failures and conditions we encounter
@@ -181,7 +185,7 @@ async def main():
         
         try:
             accelerated_result = await accelerated_workflow(destination)
-            accelerated_time = time.time() - start_time
+            accelerated_time = (time.perf_counter_ns() - start_time) / 1e9
             print(f"Result: {accelerated_result}")
             print(f"Execution time: {accelerated_time:.2f} seconds")
             
@@ -207,4 +211,4 @@ async def main():
 if __name__ == "__main__":
     # Set random seed for reproducible demo results
     random.seed(42)
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
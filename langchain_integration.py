@@ -3,8 +3,6 @@ Example of integrating Tygent with LangChain - Simple Accelerate Pattern
 Shows how to use Tygent's accelerate() function with existing LangChain agents.
 """
 
-import sys
-sys.path.append('../tygent-py')
 from tygent import accelerate
 
 # Mock LangChain components for demonstration
@@ -2,11 +2,7 @@
 Example of integrating Tygent with LangGraph.
 """
 
-import sys
-sys.path.append('../tygent-py')
 import tygent as tg
-from langchain.prompts import PromptTemplate
-from langchain.chat_models import ChatOpenAI
 from langgraph.graph import StateGraph, END
 
 def main():
@@ -47,11 +43,16 @@ def main():
         """Convert a LangGraph workflow to a Tygent DAG."""
         dag = tg.DAG(workflow.name)
         
+        # Drop the END sentinel up front so each loop below is a single pass
+        node_names = [name for name in workflow.nodes if name != END]
+        edges = [
+            (source, target)
+            for source, targets in workflow.edges.items() if source != END
+            for target in targets if target != END
+        ]
+        
         # Convert LangGraph nodes to Tygent nodes
-        for node_name in workflow.nodes:
-            if node_name == END:
-                continue
-                
+        for node_name in node_names:
             # Create a tool node for the LangGraph state function
             node = tg.ToolNode(
                 id=node_name,
@@ -62,15 +63,8 @@ def main():
             dag.add_node(node)
         
         # Add edges based on LangGraph transitions
-        for source, targets in workflow.edges.items():
-            if source == END:
-                continue
-                
-            for target in targets:
-                if target == END:
-                    continue
-                    
-                dag.add_edge(source, target)
+        for source, target in edges:
+            dag.add_edge(source, target)
         
         return dag
     
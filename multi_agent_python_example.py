@@ -7,13 +7,16 @@ This example demonstrates how to:
 3. Execute agents in parallel for improved performance
 """
 
-import asyncio
-import sys
 import os
-sys.path.append('../tygent-py')
 
 from tygent import MultiAgentManager
 
+# Use uvloop's faster event loop when it is installed
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Agent classes that work with MultiAgentManager
 class ResearcherAgent:
     async def execute(self, inputs):
@@ -67,4 +70,4 @@ async def main():
     print("\nExample completed successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
@@ -5,10 +5,14 @@ Shows how to use Tygent's accelerate() function for drop-in optimization.
 
 import os
 import asyncio
-import sys
-sys.path.append('../tygent-py')
 from tygent import accelerate
 
+# Use uvloop's faster event loop when it is installed
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Set your API key - in production use environment variables
 # os.environ["OPENAI_API_KEY"] = "your-api-key"  # Uncomment and set your API key
 
@@ -73,4 +77,4 @@ async def main():
         print(f"Performance improvement: {improvement:.1f}% faster")
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file
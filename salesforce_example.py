@@ -9,6 +9,12 @@ import asyncio
 from typing import Dict, Any, List
 from dotenv import load_dotenv
 
+# Use uvloop's faster event loop when it is installed
+try:
+    from uvloop import run
+except ImportError:
+    from asyncio import run
+
 # Load environment variables
 load_dotenv()
 
@@ -296,4 +302,4 @@ async def demonstrate_batch_processing(sf):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    run(main())
\ No newline at end of file